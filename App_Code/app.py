@@ -12,12 +12,25 @@ from tables import MUSHROOMS, MUSHROOM_LIST, SUBSTRATE_TYPES, FRUITING_BAG_SIZES
 from planner import compute_plan
 from PIL import Image
 
+
+# Serialize the schedule to CSV once per distinct plan instead of on every
+# rerun, keeping only the most recent plans
+@st.cache_data(show_spinner=False, max_entries=64)
+def _csv_bytes(blocks):
+    return pd.DataFrame(blocks).to_csv(index=False).encode("utf-8")
+
+
 st.set_page_config(page_title="Gulf Spore Workflow Forecasting Tool", layout="wide")
 
 # --- Display Gulf Spore Logo ---
-# Load and display logo
-logo = Image.open("images/GSHorizLogo.png")  # adjust path if needed
-st.image(logo, use_column_width=False, width=350)  # width can be adjusted (250–400 works well)
+# Load and decode the logo once per process, then reuse it on every rerun
+@st.cache_resource
+def _logo():
+    with Image.open("images/GSHorizLogo.png") as img:  # adjust path if needed
+        return img.copy()
+
+
+st.image(_logo(), use_column_width=False, width=350)  # width can be adjusted (250–400 works well)
 
 # Add some vertical spacing after logo
 st.markdown("<br>", unsafe_allow_html=True)
@@ -82,7 +95,7 @@ with right:
     st.subheader("Workflow Timeline")
     df = pd.DataFrame(plan["blocks"])
     st.dataframe(df, use_container_width=True)
-    st.download_button("Download schedule (CSV)", df.to_csv(index=False), "schedule.csv", "text/csv")
+    st.download_button("Download schedule (CSV)", _csv_bytes(plan["blocks"]), "schedule.csv", "text/csv")
 
 st.divider()
 # --- MIX RATIO TABLE ---
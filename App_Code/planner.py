@@ -20,13 +20,16 @@ def compute_plan(
     sub_ster_duration_days=3.0,
     num_sterilizers=2,
     gsi_bag_size_lbs=None,
-    gbs_duration_days=1.0
+    gbs_duration_days=1.0,
+    fruiting_duration_days=None
 ):
     # ---------------------------
     # 1. Fruiting (anchor step)
     # ---------------------------
     exp_ratio = mushroom_row["expected_yield_ratio"]
-    fruit_days = mushroom_row["fruiting_days"]
+    fruit_days = fruiting_duration_days
+    if fruit_days is None:
+        fruit_days = mushroom_row["fruiting_days"]
 
     # number of bags needed to reach desired yield
     fruit_num_bags = math.ceil((desired_yield_lbs * LOSS_FACTOR) / (exp_ratio * fruiting_bag_size_lbs))
@@ -8,10 +8,45 @@ Multi-plan builder + master schedule Gantt view.
 import pandas as pd
 import streamlit as st
 from datetime import date
-from tables import MUSHROOMS, MUSHROOM_LIST, SUBSTRATE_TYPES, FRUITING_BAG_SIZES_LBS
+from tables import (
+    MUSHROOMS,
+    MUSHROOM_LIST,
+    MUSHROOM_LIST_WITH_NEW,
+    MushroomSpec,
+    SUBSTRATE_TYPES,
+    FRUITING_BAG_SIZES_LBS,
+)
 from planner import compute_plan
 from PIL import Image
-import plotly.express as px
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+
+# ---------------------------------------------------------
+# CACHED CALCULATIONS
+# ---------------------------------------------------------
+# Streamlit reruns this whole script on every widget change, so plans whose
+# inputs did not change are served from the cache instead of recomputed.
+# The mushroom row is a MushroomSpec namedtuple, so it hashes as plain data.
+# The key includes free-form inputs like the yield and harvest date, so only
+# the most recent plans are kept rather than one per value ever typed.
+@st.cache_data(show_spinner=False, max_entries=64)
+def compute_plan_cached(mushroom_row, **plan_inputs):
+    return compute_plan(mushroom_row=mushroom_row, **plan_inputs)
+
+
+# The per-plan tables and CSV download are built from the same cache key, so
+# reruns reuse the DataFrames and encoded CSV instead of rebuilding them.
+# Bounded like compute_plan_cached.
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_plan_frames(mushroom_row, **plan_inputs):
+    plan = compute_plan_cached(mushroom_row, **plan_inputs)
+    df_blocks = plan["blocks"]
+    mix_df = pd.DataFrame(plan["mix_ratio"])
+    materials_df = pd.DataFrame(plan["materials"])
+    csv_bytes = df_blocks.to_csv(index=False).encode("utf-8")
+    return df_blocks, mix_df, materials_df, csv_bytes
+
 
 # ---------------------------------------------------------
 # PAGE SETUP
@@ -33,9 +68,15 @@ if "show_new_species_form" not in st.session_state:
 # ---------------------------------------------------------
 # HEADER / LOGO
 # ---------------------------------------------------------
+# Decode the logo once per process instead of on every rerun
+@st.cache_resource
+def _logo():
+    with Image.open("images/GSHorizLogo.png") as img:
+        return img.copy()
+
+
 try:
-    logo = Image.open("images/GSHorizLogo.png")
-    st.image(logo, width=350)
+    st.image(_logo(), width=350)
 except Exception:
     # If logo missing just skip
     pass
@@ -48,13 +89,16 @@ st.caption(
 # Tabs: Plan Builder + Master Schedule
 tab_builder, tab_master = st.tabs(["Plan Builder", "Master Schedule"])
 
-# This will collect all blocks from all plans for the master schedule
-master_rows = []
+# This will collect one block frame per plan for the master schedule
+master_frames = []
 
 # ---------------------------------------------------------
 # TAB 1: PLAN BUILDER
 # ---------------------------------------------------------
 with tab_builder:
+    # Plans with identical inputs in the same rerun share one result
+    _plan_memo = {}
+
     # --- TOP-OF-PAGE NEW SPECIES FORM --------------------
     if st.session_state.show_new_species_form:
         st.subheader("➕ Create New Mushroom Species")
@@ -118,23 +162,22 @@ with tab_builder:
                     st.error("Please enter a species name.")
                 else:
                     # Check against default + existing custom
-                    all_mushrooms_check = {
-                        **MUSHROOMS,
-                        **st.session_state.custom_mushrooms,
-                    }
-                    if new_species_name in all_mushrooms_check:
+                    if (
+                        new_species_name in MUSHROOMS
+                        or new_species_name in st.session_state.custom_mushrooms
+                    ):
                         st.error(
                             f"Species '{new_species_name}' already exists. "
                             "Please use a different name."
                         )
                     else:
-                        st.session_state.custom_mushrooms[new_species_name] = {
-                            "incubation_days": new_incubation_days,
-                            "cultural_inoculation_days": new_cultural_inoculation_days,
-                            "fruiting_days": new_fruiting_days,
-                            "expected_yield_ratio": new_expected_yield_ratio,
-                            "default_grain_size_lbs": new_default_grain_size,
-                        }
+                        st.session_state.custom_mushrooms[new_species_name] = MushroomSpec(
+                            incubation_days=new_incubation_days,
+                            cultural_inoculation_days=new_cultural_inoculation_days,
+                            fruiting_days=new_fruiting_days,
+                            expected_yield_ratio=new_expected_yield_ratio,
+                            default_grain_size_lbs=new_default_grain_size,
+                        )
                         st.session_state.show_new_species_form = False
                         st.success(
                             f"✓ Species '{new_species_name}' created successfully!"
@@ -148,8 +191,21 @@ with tab_builder:
         st.markdown("---")
 
     # --- COMBINED MUSHROOM LIST --------------------------
-    all_mushrooms = {**MUSHROOMS, **st.session_state.custom_mushrooms}
-    all_mushroom_list = list(all_mushrooms.keys()) + ["+New species"]
+    # Only rebuild the merged dict/list when a custom species was added or
+    # deleted; otherwise reuse the copies from the previous rerun.
+    custom_mushrooms = st.session_state.custom_mushrooms
+    if st.session_state.get("_cached_list_len") != len(custom_mushrooms):
+        if custom_mushrooms:
+            merged = {**MUSHROOMS, **custom_mushrooms}
+            st.session_state._all_mushrooms = merged
+            st.session_state._all_mushroom_list = list(merged.keys()) + ["+New species"]
+        else:
+            st.session_state._all_mushrooms = MUSHROOMS
+            st.session_state._all_mushroom_list = MUSHROOM_LIST_WITH_NEW
+        st.session_state._cached_list_len = len(custom_mushrooms)
+
+    all_mushrooms = st.session_state._all_mushrooms
+    all_mushroom_list = st.session_state._all_mushroom_list
 
     # --- NUMBER OF PLANS ---------------------------------
     num_plans = st.number_input(
@@ -167,131 +223,133 @@ with tab_builder:
         st.markdown(f"### Plan {i + 1}")
 
         # ---------- CORE INPUTS ----------
-        top_cols = st.columns(4)
-        with top_cols[0]:
-            mush_name = st.selectbox(
-                "Mushroom type",
-                all_mushroom_list,
-                index=0,
-                key=f"mush_type_{i}",
-            )
-
-            # If a custom species is selected, allow delete
-            if mush_name in st.session_state.custom_mushrooms:
-                if st.button(
-                    "🗑️ Delete this species",
-                    key=f"delete_species_{i}",
-                    use_container_width=True,
-                ):
-                    del st.session_state.custom_mushrooms[mush_name]
-                    st.success(f"Deleted '{mush_name}' successfully!")
-                    st.rerun()
-
-            # Handle +New species
-            if mush_name == "+New species":
-                st.session_state.show_new_species_form = True
-                # Use first default for calc until new species exists
-                mush_name_for_calc = MUSHROOM_LIST[0]
-            else:
-                mush_name_for_calc = mush_name
-
-        with top_cols[1]:
-            desired_yield = st.number_input(
-                "Desired yield (lbs)",
-                min_value=0,
-                value=100,
-                step=5,
-                key=f"desired_yield_{i}",
-            )
-        with top_cols[2]:
-            desired_date = st.date_input(
-                "Desired harvest date",
-                value=date.today(),
-                key=f"desired_date_{i}",
-            )
-        with top_cols[3]:
-            bag_size = st.selectbox(
-                "Fruiting bag size (lbs)",
-                FRUITING_BAG_SIZES_LBS,
-                index=0,
-                key=f"bag_size_{i}",
-            )
-
-        mid_cols = st.columns(4)
-        with mid_cols[0]:
-            substrate_type = st.selectbox(
-                "Substrate type",
-                SUBSTRATE_TYPES,
-                index=0,
-                key=f"substrate_{i}",
-            )
-        with mid_cols[1]:
-            spawn_purchased = st.toggle(
-                "Spawn purchased? (Y/N)",
-                value=True,
-                key=f"spawn_{i}",
-            )
-        with mid_cols[2]:
-            gsi_bag_size = st.selectbox(
-                "Grain spawn bag size (lbs)",
-                [3, 6],
-                index=0,
-                key=f"gsi_bag_{i}",
-            )
-        with mid_cols[3]:
-            num_sterilizers = st.number_input(
-                "# Sterilizers",
-                min_value=1,
-                value=2,
-                step=1,
-                key=f"num_sterilizers_{i}",
-            )
+        # Inputs live in a form so edits are applied together on
+        # "Update plan" instead of rerunning the app on every keystroke.
+        with st.form(f"plan_form_{i}"):
+            top_cols = st.columns(4)
+            with top_cols[0]:
+                mush_name = st.selectbox(
+                    "Mushroom type",
+                    all_mushroom_list,
+                    index=0,
+                    key=f"mush_type_{i}",
+                )
+            with top_cols[1]:
+                desired_yield = st.number_input(
+                    "Desired yield (lbs)",
+                    min_value=0,
+                    value=100,
+                    step=5,
+                    key=f"desired_yield_{i}",
+                )
+            with top_cols[2]:
+                desired_date = st.date_input(
+                    "Desired harvest date",
+                    value=date.today(),
+                    key=f"desired_date_{i}",
+                )
+            with top_cols[3]:
+                bag_size = st.selectbox(
+                    "Fruiting bag size (lbs)",
+                    FRUITING_BAG_SIZES_LBS,
+                    index=0,
+                    key=f"bag_size_{i}",
+                )
 
-        # Operational parameters
-        with st.expander("Operational parameters", expanded=True):
-            op_cols = st.columns(4)
-            with op_cols[0]:
-                sub_bags_duration = st.number_input(
-                    "Substrate Bags: duration (days)",
-                    min_value=0.0,
-                    value=1.0,
-                    step=0.5,
-                    key=f"sub_bags_duration_{i}",
+            mid_cols = st.columns(4)
+            with mid_cols[0]:
+                substrate_type = st.selectbox(
+                    "Substrate type",
+                    SUBSTRATE_TYPES,
+                    index=0,
+                    key=f"substrate_{i}",
                 )
-            with op_cols[1]:
-                sub_ster_duration = st.number_input(
-                    "Substrate Bag Sterilization: duration (days)",
-                    min_value=0.0,
-                    value=3.0,
-                    step=0.5,
-                    key=f"sub_ster_duration_{i}",
+            with mid_cols[1]:
+                spawn_purchased = st.toggle(
+                    "Spawn purchased? (Y/N)",
+                    value=True,
+                    key=f"spawn_{i}",
                 )
-            with op_cols[2]:
-                gbs_duration = st.number_input(
-                    "Grain Bag Sterilization: duration (days)",
-                    min_value=0.0,
-                    value=1.0,
-                    step=0.5,
-                    key=f"gbs_duration_{i}",
+            with mid_cols[2]:
+                gsi_bag_size = st.selectbox(
+                    "Grain spawn bag size (lbs)",
+                    [3, 6],
+                    index=0,
+                    key=f"gsi_bag_{i}",
                 )
-            with op_cols[3]:
-                fruiting_duration = st.number_input(
-                    "Fruiting: duration (days)",
-                    min_value=0.0,
-                    value=1.0,
-                    step=0.5,
-                    key=f"fruiting_duration_{i}",
+            with mid_cols[3]:
+                num_sterilizers = st.number_input(
+                    "# Sterilizers",
+                    min_value=1,
+                    value=2,
+                    step=1,
+                    key=f"num_sterilizers_{i}",
                 )
 
+            # Operational parameters
+            with st.expander("Operational parameters", expanded=True):
+                op_cols = st.columns(4)
+                with op_cols[0]:
+                    sub_bags_duration = st.number_input(
+                        "Substrate Bags: duration (days)",
+                        min_value=0.0,
+                        value=1.0,
+                        step=0.5,
+                        key=f"sub_bags_duration_{i}",
+                    )
+                with op_cols[1]:
+                    sub_ster_duration = st.number_input(
+                        "Substrate Bag Sterilization: duration (days)",
+                        min_value=0.0,
+                        value=3.0,
+                        step=0.5,
+                        key=f"sub_ster_duration_{i}",
+                    )
+                with op_cols[2]:
+                    gbs_duration = st.number_input(
+                        "Grain Bag Sterilization: duration (days)",
+                        min_value=0.0,
+                        value=1.0,
+                        step=0.5,
+                        key=f"gbs_duration_{i}",
+                    )
+                with op_cols[3]:
+                    fruiting_duration = st.number_input(
+                        "Fruiting: duration (days)",
+                        min_value=0.0,
+                        value=1.0,
+                        step=0.5,
+                        key=f"fruiting_duration_{i}",
+                    )
+
+            st.form_submit_button("Update plan")
+
+        # If a custom species is selected, allow delete
+        if mush_name in st.session_state.custom_mushrooms:
+            if st.button(
+                "🗑️ Delete this species",
+                key=f"delete_species_{i}",
+                use_container_width=True,
+            ):
+                del st.session_state.custom_mushrooms[mush_name]
+                st.success(f"Deleted '{mush_name}' successfully!")
+                st.rerun()
+
+        # Handle +New species
+        if mush_name == "+New species":
+            st.session_state.show_new_species_form = True
+            # Use first default for calc until new species exists
+            mush_name_for_calc = MUSHROOM_LIST[0]
+        else:
+            mush_name_for_calc = mush_name
 
         # ---------- RUN THIS PLAN ----------
         if desired_yield > 0:
             mush_row = all_mushrooms[mush_name_for_calc]
-            plan = compute_plan(
+            plan_inputs = dict(
                 desired_yield_lbs=desired_yield,
                 desired_harvest_date=desired_date,
                 fruiting_bag_size_lbs=bag_size,
-                mushroom_row=mush_row,
                 substrate_type=substrate_type,
                 spawn_purchased=spawn_purchased,
                 sub_bags_duration_days=sub_bags_duration,
@@ -300,6 +358,20 @@ with tab_builder:
                 gsi_bag_size_lbs=gsi_bag_size,
                 gbs_duration_days=gbs_duration,
             )
+            plan_key = (mush_row, tuple(plan_inputs.items()))
+
+            # Form inputs only change when "Update plan" is submitted, so keep
+            # this plan's last result until its submitted inputs differ.
+            stored = st.session_state.get(f"plan_result_{i}")
+            if stored is None or stored[0] != plan_key:
+                if plan_key not in _plan_memo:
+                    _plan_memo[plan_key] = (
+                        compute_plan_cached(mush_row, **plan_inputs),
+                        build_plan_frames(mush_row, **plan_inputs),
+                    )
+                stored = (plan_key, _plan_memo[plan_key])
+                st.session_state[f"plan_result_{i}"] = stored
+            plan, (df_blocks, mix_df, materials_df, csv_bytes) = stored[1]
 
             # ----- Per-plan outputs -----
             left, right = st.columns([1, 2])
@@ -309,43 +381,44 @@ with tab_builder:
 
                 start_dt = plan["summary"]["Schedule starts"]
                 end_dt = plan["summary"]["Schedule ends"]
-                st.metric("Schedule starts", start_dt.strftime("%Y-%m-%d"))
-                st.metric("Schedule ends", end_dt.strftime("%Y-%m-%d"))
-                st.metric("Total duration", plan["summary"]["Total duration"])
+                st.metric("Schedule starts", start_dt.isoformat())
+                st.metric("Schedule ends", end_dt.isoformat())
+                st.metric(
+                    "Total duration",
+                    f"{plan['summary']['weeks']} weeks, {plan['summary']['days']} days",
+                )
 
             with right:
                 st.subheader("Workflow Timeline (this plan only)")
-                df_blocks = pd.DataFrame(plan["blocks"])
                 st.dataframe(df_blocks, use_container_width=True)
                 st.download_button(
                     "Download schedule (CSV)",
-                    df_blocks.to_csv(index=False),
+                    csv_bytes,
                     f"schedule_plan_{i + 1}.csv",
                     "text/csv",
                     key=f"download_csv_{i}",
                 )
 
             st.subheader("Mix Ratio (per bag)")
-            mix_df = pd.DataFrame(plan["mix_ratio"])
             st.dataframe(mix_df, use_container_width=True)
 
             st.subheader("Materials (Total Quantities)")
-            materials_df = pd.DataFrame(plan["materials"])
             st.dataframe(materials_df, use_container_width=True)
 
             # ----- Feed into master schedule -----
-            for block in plan["blocks"]:
-                master_rows.append(
+            master_frames.append(
+                pd.DataFrame(
                     {
                         "Plan": i + 1,
                         "Mushroom": mush_name_for_calc,
-                        "Task": block["name"],
-                        "Start": block["date_start"],
-                        "End": block["date_end"],
-                        "Duration (days)": block["duration_days"],
+                        "Task": df_blocks["name"],
+                        "Start": df_blocks["date_start"],
+                        "End": df_blocks["date_end"],
+                        "Duration (days)": df_blocks["duration_days"],
                         "Desired Yield (lbs)": desired_yield,
                     }
                 )
+            )
         else:
             st.info("Enter a positive desired yield to generate a schedule.")
 
@@ -354,33 +427,108 @@ with tab_builder:
 # ---------------------------------------------------------
 # TAB 2: MASTER SCHEDULE (GANTT)
 # ---------------------------------------------------------
+# Gantt-style timeline across all plans. Bars are drawn as WebGL (scattergl)
+# line segments, one trace per task, instead of px.timeline's SVG shapes so
+# long master schedules stay responsive. The figure is cached on the master
+# table's contents, so it is only rebuilt when some plan's blocks changed.
+# Only the current master table matters, so just a few figures are kept.
+@st.cache_data(show_spinner=False, max_entries=8)
+def _build_gantt(df_master):
+    row_col = "Mushroom"   # you can change to "Plan" or combine them later
+    task_colors = qualitative.Plotly
+    fig = go.Figure()
+    for n, (task, task_df) in enumerate(df_master.groupby("Task", sort=False)):
+        color = task_colors[n % len(task_colors)]
+        starts = pd.to_datetime(task_df["Start"])
+        ends = pd.to_datetime(task_df["End"])
+
+        hover_cols = task_df[
+            ["Start", "End", "Plan", "Desired Yield (lbs)"]
+        ].astype(str)
+
+        # One start -> end segment per block; None breaks the line between bars.
+        # The hover points run along the whole bar, one per day plus both ends.
+        xs, ys = [], []
+        hover_xs, hover_ys, hover_data = [], [], []
+        for x0, x1, y, data in zip(
+            starts, ends, task_df[row_col], hover_cols.itertuples(index=False)
+        ):
+            xs += [x0, x1, None]
+            ys += [y, y, None]
+
+            points = pd.date_range(x0, x1, freq="D")
+            if points[-1] != x1:
+                points = points.append(pd.DatetimeIndex([x1]))
+            hover_xs += list(points)
+            hover_ys += [y] * len(points)
+            hover_data += [tuple(data)] * len(points)
+
+        fig.add_trace(
+            go.Scattergl(
+                x=xs,
+                y=ys,
+                mode="lines",
+                line=dict(width=18, color=color),
+                name=task,
+                legendgroup=task,
+                hoverinfo="skip",
+            )
+        )
+        # Invisible markers spread along each bar carry the hover text, so it
+        # shows anywhere on the bar, not just near one point
+        fig.add_trace(
+            go.Scattergl(
+                x=hover_xs,
+                y=hover_ys,
+                mode="markers",
+                marker=dict(size=18, color=color, opacity=0),
+                name=task,
+                legendgroup=task,
+                showlegend=False,
+                customdata=hover_data,
+                hovertemplate=(
+                    "<b>%{fullData.name}</b><br>"
+                    "Start=%{customdata[0]}<br>"
+                    "End=%{customdata[1]}<br>"
+                    "Plan=%{customdata[2]}<br>"
+                    "Desired Yield (lbs)=%{customdata[3]}"
+                    "<extra></extra>"
+                ),
+            )
+        )
+
+    fig.update_yaxes(autorange="reversed")
+    fig.update_layout(
+        legend_title_text="Task",
+        margin=dict(l=30, r=30, t=30, b=30),
+    )
+    return fig
+
+
+# The master tab runs as a fragment so its toggle only reruns this section.
+# The Gantt chart is the heaviest element on the page, so it is only built
+# once the user switches it on; until then Plan Builder edits skip Plotly.
+@st.fragment
+def render_master(df_master):
+    show_chart = st.toggle(
+        "Show Gantt chart",
+        value=False,
+        key="show_master_chart",
+    )
+
+    if show_chart:
+        st.plotly_chart(_build_gantt(df_master), use_container_width=True)
+
+    st.markdown("#### Master Schedule Table")
+    st.dataframe(df_master, use_container_width=True)
+
+
 with tab_master:
     st.subheader("Consolidated Master Schedule")
 
-    if not master_rows:
+    if not master_frames:
         st.info(
             "Build at least one plan in the **Plan Builder** tab to see the master schedule."
         )
     else:
-        df_master = pd.DataFrame(master_rows)
-
-        # Gantt-style timeline across all plans
-        fig = px.timeline(
-            df_master,
-            x_start="Start",
-            x_end="End",
-            y="Mushroom",   # you can change to "Plan" or combine them later
-            color="Task",
-            hover_data=["Plan", "Desired Yield (lbs)"],
-        )
-        fig.update_yaxes(autorange="reversed")
-        fig.update_layout(
-            margin=dict(l=30, r=30, t=30, b=30),
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-        st.markdown("#### Master Schedule Table")
-        st.dataframe(df_master, use_container_width=True)
-
-
+        render_master(pd.concat(master_frames, ignore_index=True))
@@ -7,7 +7,19 @@ It takes the user’s “desired yield” and “desired harvest date” and wor
 
 import math
 from datetime import timedelta
-from tables import MUSHROOMS, STERILIZER_CAPACITY_PER_CYCLE, SUBSTRATE_MIX_RATIOS, LOSS_FACTOR
+from fractions import Fraction
+import pandas as pd
+from tables import MUSHROOMS, STERILIZER_CAPACITY_PER_CYCLE, MIX_PER_BAG, LOSS_FACTOR
+
+# LOSS_FACTOR as an exact fraction (1.02 -> 51/50) so whole-bag counts can be
+# rounded up with integer math instead of float multiply + ceil
+_LOSS = Fraction(str(LOSS_FACTOR))
+
+
+def _with_loss(num_bags):
+    # ceil(num_bags * LOSS_FACTOR) for whole bag counts
+    return -(-num_bags * _LOSS.numerator // _LOSS.denominator)
+
 
 def compute_plan(
     desired_yield_lbs,
@@ -25,10 +37,14 @@ def compute_plan(
     # ---------------------------
     # 1. Fruiting (anchor step)
     # ---------------------------
-    exp_ratio = mushroom_row["expected_yield_ratio"]
-    fruit_days = mushroom_row["fruiting_days"]
+    exp_ratio = mushroom_row.expected_yield_ratio
+    fruit_days = mushroom_row.fruiting_days
 
     # number of bags needed to reach desired yield
+    # NOTE: every stage below rounds up to whole bags before the next stage
+    # adds its own LOSS_FACTOR buffer. Folding this into a single
+    # ceil(yield * LOSS_FACTOR**3 / ...) is not equivalent and would plan
+    # fewer bags than the spreadsheet, so keep the per-stage ceil.
     fruit_num_bags = math.ceil((desired_yield_lbs * LOSS_FACTOR) / (exp_ratio * fruiting_bag_size_lbs))
 
     fruit_end = desired_harvest_date
@@ -47,10 +63,10 @@ def compute_plan(
     # ---------------------------
     # 2. Substrate Bag Incubation
     # ---------------------------
-    sub_incub_days = mushroom_row["incubation_days"]
+    sub_incub_days = mushroom_row.incubation_days
     sub_inc_end = fruit_start
     sub_inc_start = sub_inc_end - timedelta(days=sub_incub_days)
-    sub_inc_bags = math.ceil(fruit_num_bags * LOSS_FACTOR)
+    sub_inc_bags = _with_loss(fruit_num_bags)
 
     substrate_incub = {
         "name": "Substrate Bags Incubation",
@@ -66,12 +82,12 @@ def compute_plan(
     # 3. Grain Spawn Incubation
     # ---------------------------
     if gsi_bag_size_lbs is None:
-        gsi_bag_size_lbs = mushroom_row["default_grain_size_lbs"]
+        gsi_bag_size_lbs = mushroom_row.default_grain_size_lbs
 
     if spawn_purchased:
         gsi_duration = 1
     else:
-        gsi_duration = mushroom_row["cultural_inoculation_days"] + 1
+        gsi_duration = mushroom_row.cultural_inoculation_days + 1
 
     gsi_end = sub_inc_start
     gsi_start = gsi_end - timedelta(days=gsi_duration)
@@ -92,8 +108,8 @@ def compute_plan(
     sub_ster_start = sub_ster_end - timedelta(days=sub_ster_duration_days)
 
     capacity = STERILIZER_CAPACITY_PER_CYCLE[fruiting_bag_size_lbs]
-    sub_ster_bags = math.ceil(sub_inc_bags * LOSS_FACTOR)
-    cycles = math.ceil(sub_ster_bags / (capacity * num_sterilizers))
+    sub_ster_bags = _with_loss(sub_inc_bags)
+    cycles = -(-sub_ster_bags // (capacity * num_sterilizers))
 
     substrate_ster = {
         "name": "Substrate Bags Sterilization",
@@ -113,9 +129,10 @@ def compute_plan(
     sub_bags_end = sub_ster_start
     sub_bags_start = sub_bags_end - timedelta(days=sub_bags_duration_days)
 
-    hw_per_bag = SUBSTRATE_MIX_RATIOS["hw_pellets_per_lb"] * fruiting_bag_size_lbs
-    sh_per_bag = SUBSTRATE_MIX_RATIOS["sh_pellets_per_lb"] * fruiting_bag_size_lbs
-    water_per_bag = SUBSTRATE_MIX_RATIOS["water_per_lb"] * fruiting_bag_size_lbs
+    mix = MIX_PER_BAG[fruiting_bag_size_lbs]
+    hw_per_bag = mix["hw"]
+    sh_per_bag = mix["sh"]
+    water_per_bag = mix["water"]
 
     substrate_bags = {
         "name": "Substrate Bags (Mixing)",
@@ -218,17 +235,51 @@ def compute_plan(
         },
     ]
 
+    # --- SCHEDULE TABLE ---
+    blocks_df = pd.DataFrame(blocks)
+
     # ✅ NEW: summary using earliest start instead of substrate_bags["date_start"]
     summary = {
         "Fruiting bags": fruit_num_bags,
         "Schedule starts": earliest_start,
         "Schedule ends": fruit_end,
-        "Total duration": f"{weeks} weeks, {days} days"
+        # raw numbers; the app formats them for display
+        "weeks": weeks,
+        "days": days,
+        "total_days": total_days
     }
 
     return {
-    "blocks": blocks,
+    "blocks": blocks_df,
     "mix_ratio": mix_ratio,
     "materials": materials,
     "summary": summary,
 }
+
+
+def compute_plans_batch(yields, ratios, bag_sizes, num_sterilizers):
+    # Bag and sterilizer-cycle counts for many plans at once. Each argument is
+    # an array (or list) with one entry per plan; the rounding matches
+    # compute_plan, so row n equals the counts compute_plan gives for plan n.
+    # NumPy is imported here, so the per-plan path doesn't load it.
+    import numpy as np
+
+    yields = np.asarray(yields)
+    ratios = np.asarray(ratios, dtype=float)
+    bag_sizes = np.asarray(bag_sizes)
+    num_sterilizers = np.asarray(num_sterilizers)
+
+    # ceil() returns floats, so cast back to whole bags
+    fruit_num_bags = np.ceil((yields * LOSS_FACTOR) / (ratios * bag_sizes)).astype(int)
+    sub_inc_bags = _with_loss(fruit_num_bags)
+    sub_ster_bags = _with_loss(sub_inc_bags)
+
+    capacity = np.array([STERILIZER_CAPACITY_PER_CYCLE[size] for size in bag_sizes.tolist()])
+    cycles = -(-sub_ster_bags // (capacity * num_sterilizers))
+
+    return pd.DataFrame({
+        "Fruiting bags": fruit_num_bags,
+        "Incubation bags": sub_inc_bags,
+        "Sterilization bags": sub_ster_bags,
+        "Cycles": cycles,
+    })
@@ -2,86 +2,97 @@
 tables.py
 ----------
 This file just stores fixed reference data (like an Excel lookup table).
-No type hints — just regular Python dictionaries and lists.
+No type hints — just regular Python dictionaries, lists and one namedtuple.
 """
 
+from collections import namedtuple
+
+# Growth parameters for one mushroom species (read with attribute access,
+# e.g. row.fruiting_days)
+MushroomSpec = namedtuple(
+    "MushroomSpec",
+    "incubation_days cultural_inoculation_days fruiting_days "
+    "expected_yield_ratio default_grain_size_lbs",
+)
+
 # Main table of mushroom types and their growth parameters.
-# Each mushroom name maps to another dictionary of its properties.
+# Each mushroom name maps to a MushroomSpec of its properties.
 MUSHROOMS = {
-    "Lion's Mane": {
-        "incubation_days": 14,
-        "cultural_inoculation_days": 21,
-        "fruiting_days": 21,
-        "expected_yield_ratio": 0.20,
-        "default_grain_size_lbs": 3
-    },
-    "Turkey Tail": {
-        "incubation_days": 21,
-        "cultural_inoculation_days": 18,
-        "fruiting_days": 30,
-        "expected_yield_ratio": 0.15,
-        "default_grain_size_lbs": 6
-    },
-    "Reishi": {
-        "incubation_days": 45,
-        "cultural_inoculation_days": 24,
-        "fruiting_days": 75,
-        "expected_yield_ratio": 0.16,
-        "default_grain_size_lbs": 6
-    },
-    "Blue Oyster": {
-        "incubation_days": 14,
-        "cultural_inoculation_days": 21,
-        "fruiting_days": 7,
-        "expected_yield_ratio": 0.28,
-        "default_grain_size_lbs": 3
-    },
-    "Pink Oyster": {
-        "incubation_days": 14,
-        "cultural_inoculation_days": 12,
-        "fruiting_days": 8,
-        "expected_yield_ratio": 0.24,
-        "default_grain_size_lbs": 3
-    },
-    "King Oyster": {
-        "incubation_days": 21,
-        "cultural_inoculation_days": 18,
-        "fruiting_days": 12,
-        "expected_yield_ratio": 0.22,
-        "default_grain_size_lbs": 3
-    },
-    "Yellow Oyster": {
-        "incubation_days": 14,
-        "cultural_inoculation_days": 12,
-        "fruiting_days": 8,
-        "expected_yield_ratio": 0.11,
-        "default_grain_size_lbs": 3
-    },
-    "Pearl Oyster": {
-        "incubation_days": 21,
-        "cultural_inoculation_days": 14,
-        "fruiting_days": 6,
-        "expected_yield_ratio": 0.28,
-        "default_grain_size_lbs": 3
-    },
-    "Shiitake": {
-        "incubation_days": 56,
-        "cultural_inoculation_days": 70,
-        "fruiting_days": 75,
-        "expected_yield_ratio": 0.28,
-        "default_grain_size_lbs": 6
-    },
-    "Pioppino": {
-        "incubation_days": 21,
-        "cultural_inoculation_days": 30,
-        "fruiting_days": 10,
-        "expected_yield_ratio": 0.32,
-        "default_grain_size_lbs": 3
-    }
+    "Lion's Mane": MushroomSpec(
+        incubation_days=14,
+        cultural_inoculation_days=21,
+        fruiting_days=21,
+        expected_yield_ratio=0.20,
+        default_grain_size_lbs=3,
+    ),
+    "Turkey Tail": MushroomSpec(
+        incubation_days=21,
+        cultural_inoculation_days=18,
+        fruiting_days=30,
+        expected_yield_ratio=0.15,
+        default_grain_size_lbs=6,
+    ),
+    "Reishi": MushroomSpec(
+        incubation_days=45,
+        cultural_inoculation_days=24,
+        fruiting_days=75,
+        expected_yield_ratio=0.16,
+        default_grain_size_lbs=6,
+    ),
+    "Blue Oyster": MushroomSpec(
+        incubation_days=14,
+        cultural_inoculation_days=21,
+        fruiting_days=7,
+        expected_yield_ratio=0.28,
+        default_grain_size_lbs=3,
+    ),
+    "Pink Oyster": MushroomSpec(
+        incubation_days=14,
+        cultural_inoculation_days=12,
+        fruiting_days=8,
+        expected_yield_ratio=0.24,
+        default_grain_size_lbs=3,
+    ),
+    "King Oyster": MushroomSpec(
+        incubation_days=21,
+        cultural_inoculation_days=18,
+        fruiting_days=12,
+        expected_yield_ratio=0.22,
+        default_grain_size_lbs=3,
+    ),
+    "Yellow Oyster": MushroomSpec(
+        incubation_days=14,
+        cultural_inoculation_days=12,
+        fruiting_days=8,
+        expected_yield_ratio=0.11,
+        default_grain_size_lbs=3,
+    ),
+    "Pearl Oyster": MushroomSpec(
+        incubation_days=21,
+        cultural_inoculation_days=14,
+        fruiting_days=6,
+        expected_yield_ratio=0.28,
+        default_grain_size_lbs=3,
+    ),
+    "Shiitake": MushroomSpec(
+        incubation_days=56,
+        cultural_inoculation_days=70,
+        fruiting_days=75,
+        expected_yield_ratio=0.28,
+        default_grain_size_lbs=6,
+    ),
+    "Pioppino": MushroomSpec(
+        incubation_days=21,
+        cultural_inoculation_days=30,
+        fruiting_days=10,
+        expected_yield_ratio=0.32,
+        default_grain_size_lbs=3,
+    )
 }
 
 # Lists for dropdown menus in Streamlit
 MUSHROOM_LIST = list(MUSHROOMS.keys())
+MUSHROOM_LIST_WITH_NEW = MUSHROOM_LIST + ["+New species"]
 FRUITING_BAG_SIZES_LBS = [5, 10]
 SUBSTRATE_TYPES = ["Masters Mix", "Chopped Straw", "Saw Dust"]
 
@@ -98,5 +109,15 @@ SUBSTRATE_MIX_RATIOS = {
     "water_per_lb": 0.60
 }
 
+# Mix amounts per bag (lbs), precomputed for each fruiting bag size
+MIX_PER_BAG = {
+    size: {
+        "hw": SUBSTRATE_MIX_RATIOS["hw_pellets_per_lb"] * size,
+        "sh": SUBSTRATE_MIX_RATIOS["sh_pellets_per_lb"] * size,
+        "water": SUBSTRATE_MIX_RATIOS["water_per_lb"] * size,
+    }
+    for size in FRUITING_BAG_SIZES_LBS
+}
+
 # Small buffer to cover losses
 LOSS_FACTOR = 1.02
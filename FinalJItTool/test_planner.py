@@ -0,0 +1,54 @@
+"""
+test_planner.py
+---------------
+Checks that compute_plans_batch gives the same bag and cycle counts as
+compute_plan. Run from this folder with: python -m unittest test_planner
+"""
+
+import itertools
+import unittest
+from datetime import date
+
+from planner import compute_plan, compute_plans_batch
+from tables import MUSHROOMS, FRUITING_BAG_SIZES_LBS
+
+
+class ComputePlansBatchTest(unittest.TestCase):
+    def test_matches_compute_plan(self):
+        cases = list(itertools.product(
+            MUSHROOMS.values(),
+            [1, 5, 17, 50, 100, 333, 1000, 2500],
+            FRUITING_BAG_SIZES_LBS,
+            [1, 2, 3],
+        ))
+
+        batch = compute_plans_batch(
+            yields=[y for _, y, _, _ in cases],
+            ratios=[m.expected_yield_ratio for m, _, _, _ in cases],
+            bag_sizes=[b for _, _, b, _ in cases],
+            num_sterilizers=[s for _, _, _, s in cases],
+        )
+
+        for n, (mushroom, yield_lbs, bag_size, sterilizers) in enumerate(cases):
+            plan = compute_plan(
+                desired_yield_lbs=yield_lbs,
+                desired_harvest_date=date(2026, 10, 14),
+                fruiting_bag_size_lbs=bag_size,
+                mushroom_row=mushroom,
+                substrate_type="Masters Mix",
+                spawn_purchased=True,
+                num_sterilizers=sterilizers,
+            )
+            blocks = plan["blocks"].set_index("name")
+            expected = {
+                "Fruiting bags": plan["summary"]["Fruiting bags"],
+                "Incubation bags": blocks.at["Substrate Bags Incubation", "num_bags"],
+                "Sterilization bags": blocks.at["Substrate Bags Sterilization", "num_bags"],
+                "Cycles": blocks.at["Substrate Bags Sterilization", "cycles"],
+            }
+            with self.subTest(plan=n):
+                self.assertEqual(batch.iloc[n].to_dict(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
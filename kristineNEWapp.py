@@ -5,12 +5,87 @@ Streamlit dashboard interface for the mushroom forecasting planner.
 Supports multiple independent production plans on one page.
 """
 
-import pandas as pd
 import streamlit as st
 from datetime import date
 from tables import MUSHROOMS, MUSHROOM_LIST, SUBSTRATE_TYPES, FRUITING_BAG_SIZES_LBS
 from planner import compute_plan
-from PIL import Image
+
+# Dropdown options as immutable tuples, built once per run and shared by
+# every plan's selectboxes
+MUSHROOM_LIST_T = tuple(MUSHROOM_LIST)
+SUBSTRATE_TYPES_T = tuple(SUBSTRATE_TYPES)
+BAG_SIZES_T = tuple(FRUITING_BAG_SIZES_LBS)
+GSI_BAG_SIZES_T = (3, 6)
+
+MAX_PLANS = 5
+
+
+# ---------------------------------------------------------
+# CACHED PLAN CALCULATION
+# ---------------------------------------------------------
+# Streamlit reruns the whole script on every widget change, so identical
+# plan inputs are served from the cache instead of recomputed. The mushroom
+# is passed by name (a hashable string) and looked up inside. The result
+# tables are built here too, so reruns reuse the cached DataFrames. Only the
+# most recent plans are kept, since the key grows with every yield and date
+# typed in.
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_compute_plan(
+    desired_yield_lbs,
+    desired_harvest_date,
+    fruiting_bag_size_lbs,
+    mushroom_name,
+    substrate_type,
+    spawn_purchased,
+    sub_bags_duration_days,
+    sub_ster_duration_days,
+    num_sterilizers,
+    gsi_bag_size_lbs,
+    gbs_duration_days,
+    fruiting_duration_days,
+):
+    # Imported here rather than at module level so the page header renders
+    # before pandas loads on a cold start
+    import pandas as pd
+
+    plan = compute_plan(
+        desired_yield_lbs=desired_yield_lbs,
+        desired_harvest_date=desired_harvest_date,
+        fruiting_bag_size_lbs=fruiting_bag_size_lbs,
+        mushroom_row=MUSHROOMS[mushroom_name],
+        substrate_type=substrate_type,
+        spawn_purchased=spawn_purchased,
+        sub_bags_duration_days=sub_bags_duration_days,
+        sub_ster_duration_days=sub_ster_duration_days,
+        num_sterilizers=num_sterilizers,
+        gsi_bag_size_lbs=gsi_bag_size_lbs,
+        gbs_duration_days=gbs_duration_days,
+        fruiting_duration_days=fruiting_duration_days,
+    )
+
+    # Normalize dtypes once here (nullable ints/booleans/strings and real
+    # datetimes) so st.dataframe doesn't redo the object-column conversion
+    # to Arrow every time the cached frames are rendered
+    blocks_df = pd.DataFrame(plan["blocks"]).convert_dtypes()
+    for col in ("date_start", "date_end"):
+        blocks_df[col] = pd.to_datetime(blocks_df[col])
+    mix_df = pd.DataFrame(plan["mix_ratio"]).convert_dtypes()
+    materials_df = pd.DataFrame(plan["materials"]).convert_dtypes()
+    return plan["summary"], blocks_df, mix_df, materials_df
+
+
+# The schedule's date columns are datetimes now; show them as plain dates
+BLOCKS_COLUMN_CONFIG = {
+    "date_start": st.column_config.DateColumn(format="YYYY-MM-DD"),
+    "date_end": st.column_config.DateColumn(format="YYYY-MM-DD"),
+}
+
+
+# Schedule CSV for the download button, serialized once per distinct table
+# instead of on every rerun (bytes, so Streamlit doesn't re-encode it)
+@st.cache_data(show_spinner=False, max_entries=64)
+def _df_to_csv_bytes(df):
+    return df.to_csv(index=False).encode("utf-8")
 
 
 # ---------------------------------------------------------
@@ -18,12 +93,24 @@ from PIL import Image
 # ---------------------------------------------------------
 st.set_page_config(page_title="Gulf Spore Workflow Forecasting Tool", layout="wide")
 
-# Logo
+# Logo, embedded as a data URI so it is never decoded on the Python side.
+# The file is read and encoded once per process and shared across sessions;
+# the webp copy keeps the inlined payload small.
+@st.cache_resource
+def _load_logo_b64():
+    import base64
+
+    with open("images/GSHorizLogo.webp", "rb") as f:
+        return base64.b64encode(f.read()).decode("ascii")
+
+
 try:
-    logo = Image.open("images/GSHorizLogo.png")
-    st.image(logo, width=350)
-except:
-    st.write("")  # if logo missing, ignore
+    st.markdown(
+        f'<img src="data:image/webp;base64,{_load_logo_b64()}" width="350">',
+        unsafe_allow_html=True,
+    )
+except FileNotFoundError:
+    pass  # if logo missing, ignore
 
 st.title("Workflow Forecasting Tool")
 st.caption("Plan one or more mushroom production schedules. Each plan has its own inputs and timeline.")
@@ -37,7 +124,7 @@ st.markdown("----")
 num_plans = st.number_input(
     "How many mushroom schedules do you want to plan?",
     min_value=1,
-    max_value=5,
+    max_value=MAX_PLANS,
     value=1,
     step=1,
 )
@@ -45,22 +132,45 @@ num_plans = st.number_input(
 st.markdown("----")
 
 
+# Plans that were removed lose their widget state, so drop their cached
+# results too; otherwise a re-added plan would show the old schedule
+for j in range(num_plans, MAX_PLANS):
+    st.session_state.pop(f"plan_{j}", None)
+
+
 # ---------------------------------------------------------
-# LOOP OVER PLANS
+# ONE PLAN (INPUTS + RESULTS)
 # ---------------------------------------------------------
-for i in range(num_plans):
+# Each plan keeps its bookkeeping in one session_state dict, plan_{i}:
+#   "dirty"  - set by the widget callbacks when one of the plan's inputs changed
+#   "inputs" - the inputs of the last computed plan
+#   "result" - that plan's (summary, blocks_df, mix_df, materials_df)
+# Runs where no input of the plan changed go straight to the stored result.
+def _mark_dirty(i):
+    st.session_state.setdefault(f"plan_{i}", {})["dirty"] = True
+
+
+# Each plan renders as its own fragment, so changing a widget in one plan
+# reruns only that plan instead of every plan on the page.
+@st.fragment
+def _render_plan(i):
     st.markdown(f"## Plan {i + 1}")
 
     # -----------------------------------------------------
     # INPUTS FOR THIS PLAN
     # -----------------------------------------------------
-    top_cols = st.columns(4)
+    # Both input rows are laid out up front; the fragment keeps this to one
+    # plan's columns per interaction. The op-parameter columns are created
+    # inside their form below, since form widgets must live in the form.
+    top_cols, mid_cols = st.columns(4), st.columns(4)
     with top_cols[0]:
         mush_name = st.selectbox(
             "Mushroom type",
-            MUSHROOM_LIST,
+            MUSHROOM_LIST_T,
             index=0,
             key=f"mush_type_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
     with top_cols[1]:
         desired_yield = st.number_input(
@@ -69,41 +179,52 @@ for i in range(num_plans):
             value=100,
             step=5,
             key=f"desired_yield_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
     with top_cols[2]:
         desired_date = st.date_input(
             "Desired harvest date",
             value=date.today(),
             key=f"desired_date_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
     with top_cols[3]:
         bag_size = st.selectbox(
             "Fruiting bag size (lbs)",
-            FRUITING_BAG_SIZES_LBS,
+            BAG_SIZES_T,
             index=0,
             key=f"bag_size_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
 
-    mid_cols = st.columns(4)
     with mid_cols[0]:
         substrate_type = st.selectbox(
             "Substrate type",
-            SUBSTRATE_TYPES,
+            SUBSTRATE_TYPES_T,
             index=0,
             key=f"substrate_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
     with mid_cols[1]:
         spawn_purchased = st.toggle(
             "Spawn purchased? (Y/N)",
             value=True,
             key=f"spawn_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
     with mid_cols[2]:
         gsi_bag_size = st.selectbox(
             "Grain spawn bag size (lbs)",
-            [3, 6],
+            GSI_BAG_SIZES_T,
             index=0,
             key=f"gsi_bag_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
     with mid_cols[3]:
         num_sterilizers = st.number_input(
@@ -112,104 +233,140 @@ for i in range(num_plans):
             value=2,
             step=1,
             key=f"num_sterilizers_{i}",
+            on_change=_mark_dirty,
+            args=(i,),
         )
 
     # -----------------------------------------------------
     # OPERATIONAL PARAMETERS (EXPANDER)
     # -----------------------------------------------------
     with st.expander("Operational parameters", expanded=False):
-        op_cols = st.columns(4)
-        with op_cols[0]:
-            sub_bags_duration = st.number_input(
-                "Substrate Bags: duration (days)",
-                min_value=0.0,
-                value=1.0,
-                step=0.5,
-                key=f"sub_bags_duration_{i}",
-            )
-        with op_cols[1]:
-            sub_ster_duration = st.number_input(
-                "Substrate Bag Sterilization: duration (days)",
-                min_value=0.0,
-                value=3.0,
-                step=0.5,
-                key=f"sub_ster_duration_{i}",
-            )
-        with op_cols[2]:
-            gbs_duration = st.number_input(
-                "Grain Bag Sterilization: duration (days)",
-                min_value=0.0,
-                value=1.0,
-                step=0.5,
-                key=f"gbs_duration_{i}",
-            )
+        # The durations sit in a form, so they are applied together on
+        # "Apply" instead of recomputing the plan after every keystroke.
+        # Until then the widgets keep returning the last applied values.
+        with st.form(key=f"op_params_{i}"):
+            op_cols = st.columns(4)
+            with op_cols[0]:
+                sub_bags_duration = st.number_input(
+                    "Substrate Bags: duration (days)",
+                    min_value=0.0,
+                    value=1.0,
+                    step=0.5,
+                    key=f"sub_bags_duration_{i}",
+                )
+            with op_cols[1]:
+                sub_ster_duration = st.number_input(
+                    "Substrate Bag Sterilization: duration (days)",
+                    min_value=0.0,
+                    value=3.0,
+                    step=0.5,
+                    key=f"sub_ster_duration_{i}",
+                )
+            with op_cols[2]:
+                gbs_duration = st.number_input(
+                    "Grain Bag Sterilization: duration (days)",
+                    min_value=0.0,
+                    value=1.0,
+                    step=0.5,
+                    key=f"gbs_duration_{i}",
+                )
+            with op_cols[3]:
+                # Left empty, the mushroom's own fruiting time is used
+                fruiting_duration = st.number_input(
+                    "Fruiting: duration (days)",
+                    min_value=0.0,
+                    value=None,
+                    step=0.5,
+                    placeholder="Mushroom default",
+                    key=f"fruiting_duration_{i}",
+                )
 
-        with op_cols[3]:
-            gbs_duration = st.number_input(
-                "Fruiting: duration (days)",
-                min_value=0.0,
-                value=1.0,
-                step=0.5,
-                key=f"gbs_duration_{i}",
-            )
+            st.form_submit_button("Apply", on_click=_mark_dirty, args=(i,))
 
     # -----------------------------------------------------
     # ONLY COMPUTE IF YIELD > 0
     # -----------------------------------------------------
+    # All of this plan's outputs are written into one placeholder, so they
+    # are replaced together in place on each rerun
+    results_slot = st.empty()
+
+    state = st.session_state.setdefault(f"plan_{i}", {"dirty": True})
     if desired_yield > 0:
-        mush_row = MUSHROOMS[mush_name]
-
-        plan = compute_plan(
-            desired_yield_lbs=desired_yield,
-            desired_harvest_date=desired_date,
-            fruiting_bag_size_lbs=bag_size,
-            mushroom_row=mush_row,
-            substrate_type=substrate_type,
-            spawn_purchased=spawn_purchased,
-            sub_bags_duration_days=sub_bags_duration,
-            sub_ster_duration_days=sub_ster_duration,
-            num_sterilizers=num_sterilizers,
-            gsi_bag_size_lbs=gsi_bag_size,
-            gbs_duration_days=gbs_duration,
-        )
+        # Inputs are only rebuilt after a callback flagged this plan
+        if state.get("dirty", True):
+            # Same order as _cached_compute_plan's parameters
+            inputs_tup = (
+                desired_yield,
+                desired_date,
+                bag_size,
+                mush_name,
+                substrate_type,
+                spawn_purchased,
+                sub_bags_duration,
+                sub_ster_duration,
+                num_sterilizers,
+                gsi_bag_size,
+                gbs_duration,
+                fruiting_duration,
+            )
+
+            # Reuse this plan's last result when its inputs are unchanged,
+            # which skips even the cache-key hashing of every argument
+            if state.get("inputs") != inputs_tup:
+                state["inputs"] = inputs_tup
+                state["result"] = _cached_compute_plan(*inputs_tup)
+            state["dirty"] = False
+
+        summary, blocks_df, mix_df, materials_df = state["result"]
 
         # -------------------------------------------------
         # DISPLAY RESULTS FOR THIS PLAN
         # -------------------------------------------------
-        left, right = st.columns([1, 2])
-
-        with left:
-            st.subheader("Summary")
-            st.metric("Fruiting bags", plan["summary"]["Fruiting bags"])
-
-            start_dt = plan["summary"]["Schedule starts"]
-            end_dt = plan["summary"]["Schedule ends"]
-
-            st.metric("Schedule starts", start_dt.strftime("%Y-%m-%d"))
-            st.metric("Schedule ends", end_dt.strftime("%Y-%m-%d"))
-            st.metric("Total duration", plan["summary"]["Total duration"])
-
-        with right:
-            st.subheader("Workflow Timeline")
-            df = pd.DataFrame(plan["blocks"])
-            st.dataframe(df, use_container_width=True)
-            st.download_button(
-                "Download schedule (CSV)",
-                df.to_csv(index=False),
-                f"schedule_plan_{i + 1}.csv",
-                "text/csv",
-                key=f"download_csv_{i}",
-            )
+        with results_slot.container():
+            left, right = st.columns([1, 2])
 
-        st.subheader("Mix Ratio (per bag)")
-        mix_df = pd.DataFrame(plan["mix_ratio"])
-        st.dataframe(mix_df, use_container_width=True)
+            with left:
+                st.subheader("Summary")
+                st.metric("Fruiting bags", summary["Fruiting bags"])
 
-        st.subheader("Materials (Total Quantities)")
-        materials_df = pd.DataFrame(plan["materials"])
-        st.dataframe(materials_df, use_container_width=True)
+                start_dt = summary["Schedule starts"]
+                end_dt = summary["Schedule ends"]
+
+                st.metric("Schedule starts", start_dt.isoformat())
+                st.metric("Schedule ends", end_dt.isoformat())
+                st.metric("Total duration", summary["Total duration"])
+
+            with right:
+                st.subheader("Workflow Timeline")
+                st.dataframe(
+                    blocks_df,
+                    use_container_width=True,
+                    column_config=BLOCKS_COLUMN_CONFIG,
+                )
+                st.download_button(
+                    "Download schedule (CSV)",
+                    _df_to_csv_bytes(blocks_df),
+                    f"schedule_plan_{i + 1}.csv",
+                    "text/csv",
+                    key=f"download_csv_{i}",
+                )
+
+            # These are only a few rows, so they are rendered as static
+            # tables instead of interactive grids
+            st.subheader("Mix Ratio (per bag)")
+            st.table(mix_df)
+
+            st.subheader("Materials (Total Quantities)")
+            st.table(materials_df)
 
     else:
-        st.info("Enter a positive desired yield to generate a schedule.")
+        results_slot.info("Enter a positive desired yield to generate a schedule.")
 
     st.markdown("----")
+
+
+# ---------------------------------------------------------
+# LOOP OVER PLANS
+# ---------------------------------------------------------
+for i in range(num_plans):
+    _render_plan(i)